@@ -1,5 +1,8 @@
-from flask import Flask, render_template, request, redirect, send_file
+from flask import Flask, abort, render_template, request, redirect, send_file
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+import threading
 import uuid
 
 from leitor_fatura import read_pdf_extract, load_keywords, add_keyword, write_xlsx
@@ -11,17 +14,61 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 
 KEYWORDS_FILE = Path("keywords.json")
 
+# leitura do PDF + planilha rodam fora da thread da requisição;
+# a página consulta o job pelo id até ele terminar
+executor = ThreadPoolExecutor(max_workers=2)
+JOBS: "OrderedDict[str, Future]" = OrderedDict()
+JOBS_LOCK = threading.Lock()  # requisições concorrentes leem/alteram JOBS
+MAX_JOBS_CONCLUIDOS = 20
+
+
+def buscar_job(job_id):
+    with JOBS_LOCK:
+        return JOBS.get(job_id)
+
 
 def limpar_uploads():
     for arquivo in UPLOAD_DIR.iterdir():
         if arquivo.is_file():
+            job = buscar_job(arquivo.stem)
+            if job is not None and not job.done():
+                continue  # PDF ainda sendo lido por um job
             arquivo.unlink()
 
 
+def arquivo_resultado(job_id):
+    # uma planilha por job: a página de cada job baixa o Excel dela mesma
+    return Path(f"resultado-{job_id}.xlsx")
+
+
+def limpar_jobs():
+    with JOBS_LOCK:
+        concluidos = [job_id for job_id, job in JOBS.items() if job.done()]
+        for job_id in concluidos[:-MAX_JOBS_CONCLUIDOS]:
+            del JOBS[job_id]
+            arquivo_resultado(job_id).unlink(missing_ok=True)
+
+
+def processar_fatura(job_id, caminho, keywords):
+    # workers=1: nada de fork() de pool a partir de uma thread num processo cheio delas
+    lancamentos = read_pdf_extract(caminho, keywords, workers=1)
+    # o /download só libera o arquivo depois que o job terminou sem erro
+    saida = arquivo_resultado(job_id)
+    try:
+        write_xlsx(saida, lancamentos, keywords)
+    except Exception:
+        saida.unlink(missing_ok=True)
+        raise
+    return lancamentos
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     lancamentos = []
     total = 0
+    processando = False
+    erro = None
+    keywords = load_keywords(KEYWORDS_FILE)
 
     if request.method == "POST":
         pdf = request.files.get("pdf")
@@ -29,23 +76,46 @@ def index():
         if pdf:
             # 🔥 LIMPA A PASTA ANTES DE SALVAR
             limpar_uploads()
-
-            nome = f"{uuid.uuid4()}.pdf"
-            caminho = UPLOAD_DIR / nome
-            pdf.save(caminho)
-
-            keywords = load_keywords(KEYWORDS_FILE)
-            lancamentos = read_pdf_extract(caminho, keywords)
+            limpar_jobs()
+
+            job_id = str(uuid.uuid4())
+            caminho = UPLOAD_DIR / f"{job_id}.pdf"
+            # registra o id (Future ainda pendente) antes de salvar o PDF: um
+            # limpar_uploads() concorrente já vê o job como em andamento e não apaga
+            with JOBS_LOCK:
+                JOBS[job_id] = Future()
+            try:
+                pdf.save(caminho)
+                job = executor.submit(processar_fatura, job_id, caminho, keywords)
+            except Exception:
+                with JOBS_LOCK:
+                    del JOBS[job_id]
+                caminho.unlink(missing_ok=True)
+                raise
+            with JOBS_LOCK:
+                JOBS[job_id] = job
+            return redirect(f"/?job={job_id}")
+
+    job_id = request.args.get("job", "")
+    job = buscar_job(job_id)
+    if job is not None:
+        if not job.done():
+            processando = True
+        elif job.exception() is not None:
+            app.logger.error("Falha ao processar fatura", exc_info=job.exception())
+            erro = "Não foi possível processar esse arquivo. Confira se é um PDF de fatura válido."
+        else:
+            lancamentos = job.result()
             total = sum(l.valor for l in lancamentos)
 
-            output = Path("resultado.xlsx")
-            write_xlsx(output, lancamentos, keywords)
-
     return render_template(
         "index.html",
         lancamentos=lancamentos,
         total=total,
-        keywords=load_keywords(KEYWORDS_FILE),
+        keywords=keywords,
+        processando=processando,
+        erro=erro,
+        job_id=job_id,
     )
 
 
@@ -59,7 +129,11 @@ def add_kw():
 
 @app.route("/download")
 def download():
-    return send_file("resultado.xlsx", as_attachment=True)
+    job_id = request.args.get("job", "")
+    job = buscar_job(job_id)
+    if job is None or not job.done() or job.exception() is not None:
+        abort(404)
+    return send_file(arquivo_resultado(job_id).resolve(), as_attachment=True, download_name="resultado.xlsx")
 
 
 if __name__ == "__main__":
@@ -1,15 +1,37 @@
 import argparse
 import json
+import mmap
+import os
+import queue
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, Iterator, List, Optional, Dict, Pattern, Set, Tuple
 
 import pdfplumber
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
+import xlsxwriter
+
+try:
+    # opcional: filtro multi-termo em uma passada (pip install pyahocorasick)
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # opcional: JSON em Rust pro keywords.json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # opcional: extração de texto nativa (PDFium), bem mais rápida que o pdfplumber
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 
 
 # -----------------------------
@@ -19,31 +41,60 @@ from openpyxl.utils import get_column_letter
 DEFAULT_KEYWORDS_FILE = "keywords.json"
 
 
-def load_keywords(path: Path) -> List[str]:
-    if not path.exists():
-        return ["UBER", "99"]
-    data = json.loads(path.read_text(encoding="utf-8"))
+# cache em memória por arquivo: ((mtime_ns, tamanho), keywords, keywords em caixa alta);
+# só relê se o arquivo mudou
+_kw_cache: Dict[str, Tuple[Tuple[int, int], List[str], Set[str]]] = {}
+
+
+def _cached_keywords(path: Path) -> Tuple[List[str], Set[str]]:
+    # devolve os objetos do cache: quem chama não deve alterar
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        kws = ["UBER", "99"]
+        return kws, {k.upper() for k in kws}
+    key = str(path.resolve())
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _kw_cache.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1], cached[2]
+    if orjson is not None:
+        data = orjson.loads(path.read_bytes())
+    else:
+        data = json.loads(path.read_text(encoding="utf-8"))
     kws = data.get("keywords", [])
-    return [str(k).strip() for k in kws if str(k).strip()]
+    kws = [str(k).strip() for k in kws if str(k).strip()]
+    upper = {k.upper() for k in kws}
+    _kw_cache[key] = (sig, kws, upper)
+    return kws, upper
+
+
+def load_keywords(path: Path) -> List[str]:
+    return list(_cached_keywords(path)[0])
 
 
 def save_keywords(path: Path, keywords: List[str]) -> None:
-    path.write_text(
-        json.dumps({"keywords": keywords}, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    if orjson is not None:
+        # mesmo formato do json.dumps abaixo (UTF-8 sem escape, indent 2)
+        path.write_bytes(orjson.dumps({"keywords": keywords}, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(
+            json.dumps({"keywords": keywords}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+    # não confia só no mtime (resolução grossa em alguns sistemas de arquivos)
+    _kw_cache.pop(str(path.resolve()), None)
 
 
 def add_keyword(path: Path, keyword: str) -> None:
     keyword = keyword.strip()
     if not keyword:
         raise ValueError("Keyword vazia.")
-    kws = load_keywords(path)
+    kws, kws_upper = _cached_keywords(path)
     # padroniza em caixa alta pra bater melhor
     up = keyword.upper()
-    if up not in [k.upper() for k in kws]:
-        kws.append(keyword)
-        save_keywords(path, kws)
+    if up not in kws_upper:
+        save_keywords(path, kws + [keyword])
 
 
 def remove_keyword(path: Path, keyword: str) -> None:
@@ -61,7 +112,7 @@ def remove_keyword(path: Path, keyword: str) -> None:
 # -----------------------------
 
 # Datas comuns em fatura BR: 31/01 ou 31/01/2026
-DATE_RE = re.compile(r"\b(\d{2}/\d{2})(?:/(\d{2,4}))?\b")
+DATE_RE = re.compile(r"\b(?P<ddmm>\d{2}/\d{2})(?:/(?P<yyyy>\d{2,4}))?\b")
 
 # Valores: 12,34  |  1.234,56  |  -12,34  |  (12,34)
 AMOUNT_RE = re.compile(
@@ -71,6 +122,16 @@ AMOUNT_RE = re.compile(
     r"(?P<neg_par2>\))?"
 )
 
+# Data e valor numa passada só: DATE tem prioridade na mesma posição; os grupos
+# mantêm os nomes do DATE_RE/AMOUNT_RE (format_date / amount_from_match)
+TOKEN_RE = re.compile(
+    r"(?P<DATE>" + DATE_RE.pattern + r")"
+    r"|(?P<AMT>" + AMOUNT_RE.pattern + r")"
+)
+
+# Espaços/tabs repetidos (normalize_text)
+_WS_RE = re.compile(r"[ \t]+")
+
 CURRENCY_HINTS = ["R$", "BRL"]
 
 
@@ -86,12 +147,24 @@ def br_money_to_float(s: str) -> float:
     return val
 
 
+def amount_from_match(m: "re.Match[str]") -> float:
+    # caminho rápido pro AMOUNT_RE: os grupos já separam sinal/parênteses/número,
+    # então não precisa do strip/replace genérico do br_money_to_float
+    val = float(m.group("num").replace(".", "").replace(",", "."))
+    if m.group("sign"):
+        val = -val
+    if m.group("neg_par") and m.group("neg_par2"):
+        val = -val
+    return val
+
+
 def normalize_text(s: str) -> str:
     # facilita match (sem mexer em acentos, só normaliza espaços)
-    return re.sub(r"[ \t]+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
 
-@dataclass
+# slots: sem __dict__ por instância (menos memória e pickle mais barato pro pool)
+@dataclass(slots=True)
 class Lancamento:
     app: str
     data: str  # "dd/mm" ou "dd/mm/aaaa" (como veio)
@@ -100,12 +173,7 @@ class Lancamento:
     pagina: int
 
 
-def find_best_date(line: str) -> Optional[str]:
-    m = DATE_RE.search(line)
-    if not m:
-        return None
-    ddmm = m.group(1)
-    yyyy = m.group(2)
+def format_date(ddmm: str, yyyy: Optional[str]) -> str:
     if yyyy:
         if len(yyyy) == 2:
             # heurística: 20xx
@@ -114,67 +182,142 @@ def find_best_date(line: str) -> Optional[str]:
     return ddmm
 
 
-def find_best_amount(line: str) -> Optional[float]:
-    # pega o último valor da linha (normalmente o valor do lançamento fica no fim)
-    matches = list(AMOUNT_RE.finditer(line))
-    if not matches:
-        return None
-    m = matches[-1]
-    raw = m.group(0)
-    # evita capturar coisas que sejam tipo "10/12" (não casa com AMOUNT_RE, ok)
-    try:
-        return br_money_to_float(raw)
-    except Exception:
-        return None
+def build_keyword_filter(keywords: List[str]) -> Callable[[str], bool]:
+    # filtro barato por linha (recebe a linha crua já em caixa alta).
+    # usa o maior pedaço sem espaço de cada termo, então nunca descarta uma
+    # linha que guess_app_from_line aceitaria depois do normalize_text.
+    needles = {max(k.upper().split(), key=len) for k in keywords if k.strip()}
+    if not needles:
+        return lambda up: False
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for n in needles:
+            automaton.add_word(n, n)
+        automaton.make_automaton()
+        return lambda up: next(automaton.iter(up), None) is not None
+
+    needle_re = re.compile("|".join(re.escape(n) for n in sorted(needles, key=len, reverse=True)))
+    return lambda up: needle_re.search(up) is not None
+
+
+@dataclass(frozen=True)
+class KeywordMatcher:
+    # termos já em caixa alta + estruturas compiladas (monta uma vez por PDF)
+    upper: Tuple[str, ...]
+    regex: Pattern[str]
+    line_filter: Callable[[str], bool]
+
+
+def _keyword_pattern(kw: str) -> str:
+    # espaço no termo aceita qualquer sequência de espaço/tab, então dá pra procurar
+    # direto na linha crua (mesmo resultado que depois do normalize_text)
+    return r"[ \t]+".join(re.escape(part) for part in kw.split())
+
 
+def build_keyword_matcher(keywords: List[str]) -> KeywordMatcher:
+    kw_upper = tuple(k.upper() for k in keywords)
+    if kw_upper:
+        # um grupo nomeado por termo: um só search em C devolve qual casou
+        kw_re = re.compile("|".join(f"(?P<k{i}>{_keyword_pattern(k)})" for i, k in enumerate(kw_upper)))
+    else:
+        kw_re = re.compile(r"(?!)")  # nunca casa
+    return KeywordMatcher(upper=kw_upper, regex=kw_re, line_filter=build_keyword_filter(keywords))
 
-def guess_app_from_line(line: str, keywords: List[str]) -> Optional[str]:
-    up = line.upper()
-    for kw in keywords:
-        if kw.upper() in up:
-            # “nome” que aparece na planilha (pode ser a própria keyword)
-            # Se quiser padronizar Uber/99, dá pra ajustar aqui.
-            return kw.upper()
-    return None
 
+@lru_cache(maxsize=16)
+def _cached_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return build_keyword_matcher(list(keywords))
+
+
+def get_keyword_matcher(keywords: List[str]) -> KeywordMatcher:
+    # mesmo conjunto de termos (ex.: várias requisições do Flask) reaproveita
+    # regex e autômato já compilados em vez de montar tudo de novo
+    return _cached_matcher(tuple(keywords))
+
+
+def guess_app_from_line(line_upper: str, matcher: KeywordMatcher) -> Optional[str]:
+    # recebe a linha já em caixa alta (calculada uma vez só por linha)
+    m = matcher.regex.search(line_upper)
+    if not m:
+        return None
+    # “nome” que aparece na planilha (pode ser a própria keyword)
+    # Se quiser padronizar Uber/99, dá pra ajustar aqui.
+    return matcher.upper[int(m.lastgroup[1:])]
+
+
+def iter_line_spans(text: str) -> Iterator[Tuple[int, int]]:
+    # gera (início, fim) de cada linha sob demanda, sem montar a lista do splitlines().
+    # "\r" de "\r\n" (pypdfium2) fica no fim da linha e sai no normalize_text
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end < 0:
+            if start < len(text):
+                yield start, len(text)
+            return
+        yield start, end
+        start = end + 1
+
+
+def extract_candidates_from_text(
+    text: str,
+    page_index: int,
+    keywords: List[str],
+    matcher: Optional[KeywordMatcher] = None,
+) -> List[Lancamento]:
+    if matcher is None:
+        matcher = get_keyword_matcher(keywords)
 
-def extract_candidates_from_text(text: str, page_index: int, keywords: List[str]) -> List[Lancamento]:
     results: List[Lancamento] = []
-    for raw_line in text.splitlines():
-        line = normalize_text(raw_line)
-        if not line:
+    # corta a página inteira antes do loop por linha se nenhum termo aparece nela
+    # (os pedaços do filtro não têm espaço, então não casam atravessando linhas)
+    up_text = text.upper()
+    if not matcher.line_filter(up_text):
+        return results
+
+    # mesmo tamanho => cada caractere virou exatamente um: dá pra fatiar a
+    # página em caixa alta nas mesmas posições em vez de chamar upper() por linha
+    same_len = len(up_text) == len(text)
+    for start, end in iter_line_spans(text):
+        raw_line = text[start:end]
+        up = up_text[start:end] if same_len else raw_line.upper()
+        # corta cedo: a maioria das linhas não tem termo nenhum
+        if not matcher.line_filter(up):
             continue
 
-        app = guess_app_from_line(line, keywords)
+        app = guess_app_from_line(up, matcher)
         if not app:
             continue
 
-        data = find_best_date(line)
-        valor = find_best_amount(line)
+        line = normalize_text(raw_line)
+
+        # uma passada só do TOKEN_RE: primeira data, último valor (o do lançamento)
+        data = None
+        last = None
+        for m in TOKEN_RE.finditer(line):
+            if m.lastgroup == "AMT":
+                last = m
+            elif data is None:
+                data = format_date(m.group("ddmm"), m.group("yyyy"))
 
         # Heurística: se não veio data/valor na mesma linha, tenta “colar” o que dá.
         # Aqui mantemos simples e só registra se achar valor.
-        if valor is None:
+        if last is None:
             continue
+        valor = amount_from_match(last)
 
-        # descrição = linha sem o valor final (tentativa)
-        descricao = line
-        # remove o último valor detectado do fim, se estiver no fim
-        # (ajuda a deixar a descrição mais limpa)
-        last_amount = AMOUNT_RE.findall(line)
-        if last_amount:
-            # remove apenas a última ocorrência numérica
-            descricao = AMOUNT_RE.sub("", descricao, count=1)  # remove a primeira ocorrência
-            # como removemos a primeira, nem sempre é a última.
-            # então fazemos um “jeitinho”: se ficou ruim, mantém original.
-            if len(descricao.strip()) < 3:
-                descricao = line
+        # descrição = linha sem o último valor detectado
+        descricao = (line[:last.start()] + line[last.end():]).strip()
+        # se ficou ruim, mantém original
+        if len(descricao) < 3:
+            descricao = line
 
         results.append(
             Lancamento(
                 app=app,
                 data=data or "",
-                descricao=line,
+                descricao=descricao,
                 valor=valor,
                 pagina=page_index + 1,
             )
@@ -182,14 +325,171 @@ def extract_candidates_from_text(text: str, page_index: int, keywords: List[str]
     return results
 
 
-def read_pdf_extract(pdf_path: Path, keywords: List[str]) -> List[Lancamento]:
+# abaixo disso não compensa subir processos
+PARALLEL_MIN_PAGES = 4
+
+
+# PDFium não é thread-safe (nem entre documentos diferentes): toda chamada a ele
+# passa por esse lock, já que jobs/threads de prefetch podem rodar ao mesmo tempo
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PdfTextReader:
+    # texto cru por página: pypdfium2 quando disponível, pdfplumber como reserva
+    # (página sem texto no PDFium, ex. escaneada, cai pro pdfplumber)
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self._pdfium = None
+        self._plumber = None
+        self._file = None
+        self._mm = None
+        if pdfium is not None:
+            try:
+                with _PDFIUM_LOCK:
+                    self._pdfium = pdfium.PdfDocument(pdf_path)
+            except pdfium.PdfiumError:
+                self._pdfium = None
+
+    def __enter__(self) -> "PdfTextReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pdfium is not None:
+            with _PDFIUM_LOCK:
+                self._pdfium.close()
+            self._pdfium = None
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _plumber_pdf(self):
+        if self._plumber is None:
+            # pdfminer faz muito seek/read pequeno: com mmap isso vira acesso à
+            # memória (page cache do SO), sem syscall por leitura
+            self._file = open(self.pdf_path, "rb")
+            try:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # arquivo vazio não dá pra mapear
+                self._mm = None
+            self._plumber = pdfplumber.open(self._mm if self._mm is not None else self._file)
+        return self._plumber
+
+    @property
+    def uses_pdfium(self) -> bool:
+        return self._pdfium is not None
+
+    def __len__(self) -> int:
+        if self._pdfium is not None:
+            with _PDFIUM_LOCK:
+                return len(self._pdfium)
+        return len(self._plumber_pdf().pages)
+
+    def page_text(self, i: int) -> str:
+        if self._pdfium is not None:
+            with _PDFIUM_LOCK:
+                page = self._pdfium[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            if text.strip():
+                return text
+        return self._plumber_pdf().pages[i].extract_text() or ""
+
+
+# quantas páginas o leitor pode adiantar enquanto a anterior é parseada
+PREFETCH_PAGES = 4
+
+
+def _iter_page_texts(reader: PdfTextReader, start: int, stop: int) -> Iterator[Tuple[int, str]]:
+    # produtor/consumidor: uma thread extrai o texto da página i+1 enquanto
+    # quem chamou roda as regex na página i
+    q: "queue.Queue[Tuple[int, Optional[str], Optional[BaseException]]]" = queue.Queue(maxsize=PREFETCH_PAGES)
+    stop_evt = threading.Event()
+
+    def produce() -> None:
+        try:
+            for i in range(start, stop):
+                if stop_evt.is_set():
+                    return
+                q.put((i, reader.page_text(i), None))
+        except BaseException as e:
+            q.put((-1, None, e))
+            return
+        q.put((-1, None, None))
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            i, text, err = q.get()
+            if err is not None:
+                raise err
+            if text is None:
+                return
+            yield i, text
+    finally:
+        # se o consumidor saiu antes (erro), destrava o produtor antes de fechar o PDF
+        stop_evt.set()
+        while worker.is_alive():
+            try:
+                q.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        worker.join()
+
+
+def _extract_pages(
+    reader: PdfTextReader, start: int, stop: int, keywords: List[str], matcher: KeywordMatcher
+) -> List[Lancamento]:
+    lancs: List[Lancamento] = []
+    for i, text in _iter_page_texts(reader, start, stop):
+        if not text.strip():
+            continue
+        lancs.extend(extract_candidates_from_text(text, i, keywords, matcher))
+    return lancs
+
+
+def _process_page_range(pdf_path: str, start: int, stop: int, keywords: List[str]) -> List[Lancamento]:
+    # roda no processo filho: reabre o PDF e remonta o matcher (lambdas não vão por pickle)
+    matcher = get_keyword_matcher(keywords)
+    with PdfTextReader(pdf_path) as reader:
+        return _extract_pages(reader, start, stop, keywords, matcher)
+
+
+def read_pdf_extract(pdf_path: Path, keywords: List[str], workers: Optional[int] = None) -> List[Lancamento]:
+    with PdfTextReader(str(pdf_path)) as reader:
+        n_pages = len(reader)
+        workers = min(workers or os.cpu_count() or 1, n_pages)
+        # com PDFium a extração já é rápida: subir o pool custa mais que o PDF inteiro
+        if reader.uses_pdfium or n_pages < PARALLEL_MIN_PAGES or workers <= 1:
+            return _extract_pages(reader, 0, n_pages, keywords, get_keyword_matcher(keywords))
+
+    # páginas são independentes: um bloco contíguo por worker, então cada
+    # processo abre o PDF uma vez só
+    chunk = -(-n_pages // workers)
+    starts = range(0, n_pages, chunk)
+    stops = [min(s + chunk, n_pages) for s in starts]
     lancs: List[Lancamento] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text() or ""
-            if not text.strip():
-                continue
-            lancs.extend(extract_candidates_from_text(text, i, keywords))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(
+            _process_page_range,
+            [str(pdf_path)] * len(starts),
+            starts,
+            stops,
+            [keywords] * len(starts),
+        ):
+            lancs.extend(part)
     return lancs
 
 
@@ -197,73 +497,78 @@ def read_pdf_extract(pdf_path: Path, keywords: List[str]) -> List[Lancamento]:
 # Excel output
 # -----------------------------
 
-def autosize_columns(ws) -> None:
-    for col in ws.columns:
-        max_len = 0
-        col_letter = get_column_letter(col[0].column)
-        for cell in col:
-            val = "" if cell.value is None else str(cell.value)
-            max_len = max(max_len, len(val))
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 60)
+MONEY_FORMAT = r'"R$" #,##0.00;[Red]\-"R$" #,##0.00'
 
+# estilos definidos uma vez só; cada workbook registra cada um uma única vez
+BOLD = {"bold": True}
+HEADER_STYLE = {**BOLD, "bg_color": "#EEEEEE", "align": "center"}
+MONEY_STYLE = {"num_format": MONEY_FORMAT}
+BOLD_MONEY_STYLE = {**BOLD, **MONEY_STYLE}
 
-def write_xlsx(output_path: Path, lancs: List[Lancamento], keywords: List[str]) -> None:
-    wb = Workbook()
 
-    # Aba Lancamentos
-    ws = wb.active
-    ws.title = "Lancamentos"
+def _set_widths(ws, col_max: List[int]) -> None:
+    for c, max_len in enumerate(col_max):
+        ws.set_column(c, c, min(max_len + 2, 60))
 
-    headers = ["App/Termo", "Data", "Descrição", "Valor (R$)", "Página"]
-    ws.append(headers)
 
-    header_fill = PatternFill(start_color="FFEEEEEE", end_color="FFEEEEEE", fill_type="solid")
-    for c in range(1, len(headers) + 1):
-        cell = ws.cell(row=1, column=c)
-        cell.font = Font(bold=True)
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
+def write_xlsx(output_path: Path, lancs: List[Lancamento], keywords: List[str]) -> None:
+    # constant_memory: cada linha vai direto pro arquivo e é liberada
+    wb = xlsxwriter.Workbook(str(output_path), {"constant_memory": True})
 
-    for l in lancs:
-        ws.append([l.app, l.data, l.descricao, l.valor, l.pagina])
+    header_fmt = wb.add_format(HEADER_STYLE)
+    money_fmt = wb.add_format(MONEY_STYLE)
+    bold_fmt = wb.add_format(BOLD)
+    bold_money_fmt = wb.add_format(BOLD_MONEY_STYLE)
 
-    # formatação básica
-    for row in range(2, ws.max_row + 1):
-        ws.cell(row=row, column=4).number_format = '"R$" #,##0.00;[Red]\-"R$" #,##0.00'
+    # Aba Lancamentos
+    ws = wb.add_worksheet("Lancamentos")
 
-    autosize_columns(ws)
+    headers = ["App/Termo", "Data", "Descrição", "Valor (R$)", "Página"]
+    ws.write_row(0, 0, headers, header_fmt)
+
+    # largura das colunas calculada no mesmo loop da escrita (sem 2ª passada)
+    col_max = [len(h) for h in headers]
+    for r, l in enumerate(lancs, start=1):
+        # write_string: texto da fatura nunca deve virar fórmula/URL
+        ws.write_string(r, 0, l.app)
+        ws.write_string(r, 1, l.data)
+        ws.write_string(r, 2, l.descricao)
+        ws.write_number(r, 3, l.valor, money_fmt)
+        ws.write_number(r, 4, l.pagina)
+        for c, v in enumerate((l.app, l.data, l.descricao, str(l.valor), str(l.pagina))):
+            if len(v) > col_max[c]:
+                col_max[c] = len(v)
+    _set_widths(ws, col_max)
 
     # Aba Resumo
-    ws2 = wb.create_sheet("Resumo")
-    ws2.append(["Termo", "Total (R$)"])
-    for c in range(1, 3):
-        cell = ws2.cell(row=1, column=c)
-        cell.font = Font(bold=True)
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
+    ws2 = wb.add_worksheet("Resumo")
 
     totals: Dict[str, float] = {}
     for l in lancs:
         totals[l.app] = totals.get(l.app, 0.0) + l.valor
 
+    headers2 = ["Termo", "Total (R$)"]
+    ws2.write_row(0, 0, headers2, header_fmt)
+    col_max = [len(h) for h in headers2]
+
     # garante que apareçam todos os termos do keywords, mesmo que 0
-    for kw in keywords:
+    r = 0
+    for r, kw in enumerate(keywords, start=1):
         key = kw.upper()
-        ws2.append([key, round(totals.get(key, 0.0), 2)])
-
-    total_geral = sum(totals.values())
-    ws2.append(["TOTAL GERAL", round(total_geral, 2)])
-
-    # formata valores
-    for row in range(2, ws2.max_row + 1):
-        ws2.cell(row=row, column=2).number_format = '"R$" #,##0.00;[Red]\-"R$" #,##0.00'
-        if ws2.cell(row=row, column=1).value == "TOTAL GERAL":
-            ws2.cell(row=row, column=1).font = Font(bold=True)
-            ws2.cell(row=row, column=2).font = Font(bold=True)
-
-    autosize_columns(ws2)
-
-    wb.save(str(output_path))
+        total = round(totals.get(key, 0.0), 2)
+        ws2.write_string(r, 0, key)
+        ws2.write_number(r, 1, total, money_fmt)
+        col_max[0] = max(col_max[0], len(key))
+        col_max[1] = max(col_max[1], len(str(total)))
+
+    total_geral = round(sum(totals.values()), 2)
+    ws2.write_string(r + 1, 0, "TOTAL GERAL", bold_fmt)
+    ws2.write_number(r + 1, 1, total_geral, bold_money_fmt)
+    col_max[0] = max(col_max[0], len("TOTAL GERAL"))
+    col_max[1] = max(col_max[1], len(str(total_geral)))
+    _set_widths(ws2, col_max)
+
+    wb.close()
 
 
 # -----------------------------